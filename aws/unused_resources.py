@@ -3,10 +3,15 @@ Find unused AWS resources for cost optimization.
 Identifies unattached EBS volumes, idle load balancers, and unused Elastic IPs.
 """
 
+import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 
 import boto3
 import click
@@ -14,12 +19,32 @@ from botocore.exceptions import ClientError
 from rich.console import Console
 from rich.table import Table
 
+from utils.output import PLAIN_ROW_THRESHOLD, write_plain_table
+from utils.throttle import (
+    region_bucket,
+    throttle_describe_calls,
+    throttle_describe_calls_async,
+)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 console = Console()
 
-
-@dataclass
+# Monthly EBS cost per GB, by volume type.
+_EBS_RATES: Mapping[str, float] = MappingProxyType(
+    {
+        "gp2": 0.10,
+        "gp3": 0.08,
+        "io1": 0.125,
+        "io2": 0.125,
+        "st1": 0.045,
+        "sc1": 0.025,
+        "standard": 0.05,
+    }
+)
+
+
+@dataclass(slots=True)
 class UnusedResource:
     """Represents an unused AWS resource."""
 
@@ -34,169 +59,349 @@ class UnusedResource:
 class UnusedResourceFinder:
     """Find unused AWS resources across regions."""
 
-    def __init__(self, regions: Optional[list[str]] = None):
+    # Region list shared by all finders in the process.
+    _all_regions: Optional[list[str]] = None
+
+    def __init__(
+        self,
+        regions: Optional[list[str]] = None,
+        max_workers: int = 16,
+    ):
         self.session = boto3.Session()
+        self._clients: dict[tuple[str, str], Any] = {}
+        self._clients_lock = threading.Lock()
         self.regions = regions or self._get_all_regions()
+        self.max_workers = max_workers
         self.unused_resources: list[UnusedResource] = []
 
+    def _client(self, service: str, region: str) -> Any:
+        """Get a cached boto3 client for a service in a region."""
+        key = (service, region)
+        # Sessions are not thread-safe, so client creation is serialized;
+        # the clients themselves can be shared between threads.
+        with self._clients_lock:
+            if key not in self._clients:
+                client = self.session.client(service, region_name=region)
+                if service == "ec2":
+                    throttle_describe_calls(client, region_bucket(region))
+                self._clients[key] = client
+            return self._clients[key]
+
     def _get_all_regions(self) -> list[str]:
-        """Get all available AWS regions."""
-        ec2 = self.session.client("ec2", region_name="us-east-1")
-        regions = ec2.describe_regions()["Regions"]
-        return [r["RegionName"] for r in regions]
+        """Get all available AWS regions, looked up once per process."""
+        if UnusedResourceFinder._all_regions is None:
+            ec2 = self._client("ec2", "us-east-1")
+            regions = ec2.describe_regions()["Regions"]
+            UnusedResourceFinder._all_regions = [r["RegionName"] for r in regions]
+        return list(UnusedResourceFinder._all_regions)
 
     def find_unattached_volumes(self, region: str) -> list[UnusedResource]:
         """Find EBS volumes that are not attached to any instance."""
         resources = []
-        ec2 = self.session.client("ec2", region_name=region)
+        ec2 = self._client("ec2", region)
 
         try:
-            volumes = ec2.describe_volumes(
-                Filters=[{"Name": "status", "Values": ["available"]}]
-            )["Volumes"]
-
-            for vol in volumes:
-                size_gb = vol["Size"]
-                vol_type = vol["VolumeType"]
-                monthly_cost = self._estimate_ebs_cost(size_gb, vol_type)
-
-                resources.append(
-                    UnusedResource(
-                        resource_type="EBS Volume",
-                        resource_id=vol["VolumeId"],
-                        region=region,
-                        created=vol["CreateTime"].replace(tzinfo=None),
-                        estimated_monthly_cost=monthly_cost,
-                        details=f"{size_gb}GB {vol_type}",
-                    )
-                )
+            pages = ec2.get_paginator("describe_volumes").paginate(
+                Filters=[{"Name": "status", "Values": ["available"]}],
+                PaginationConfig={"PageSize": 500},
+            )
+            resources = [
+                self._volume_resource(vol, region)
+                for page in pages
+                for vol in page["Volumes"]
+            ]
         except ClientError as e:
             logger.warning(f"Error checking volumes in {region}: {e}")
 
         return resources
 
+    def _volume_resource(self, vol: dict, region: str) -> UnusedResource:
+        """Build an UnusedResource from a describe_volumes entry."""
+        size_gb = vol["Size"]
+        vol_type = vol["VolumeType"]
+
+        return UnusedResource(
+            resource_type="EBS Volume",
+            resource_id=vol["VolumeId"],
+            region=region,
+            created=vol["CreateTime"].replace(tzinfo=None),
+            estimated_monthly_cost=self._estimate_ebs_cost(size_gb, vol_type),
+            details=f"{size_gb}GB {vol_type}",
+        )
+
     def find_idle_load_balancers(self, region: str) -> list[UnusedResource]:
         """Find ALBs with no targets or zero request count."""
         resources = []
-        elbv2 = self.session.client("elbv2", region_name=region)
-        cloudwatch = self.session.client("cloudwatch", region_name=region)
+        elbv2 = self._client("elbv2", region)
+        # One pool per region scan, sized so it cannot outgrow the client's
+        # HTTP connection pool.
+        health_workers = min(8, elbv2.meta.config.max_pool_connections)
 
         try:
-            lbs = elbv2.describe_load_balancers()["LoadBalancers"]
-
-            for lb in lbs:
-                lb_arn = lb["LoadBalancerArn"]
-                lb_name = lb["LoadBalancerName"]
-
-                target_groups = elbv2.describe_target_groups(
-                    LoadBalancerArn=lb_arn
-                )["TargetGroups"]
+            pages = elbv2.get_paginator("describe_load_balancers").paginate(
+                PaginationConfig={"PageSize": 400}
+            )
+            lbs = (lb for page in pages for lb in page["LoadBalancers"])
 
-                has_healthy_targets = False
-                for tg in target_groups:
-                    health = elbv2.describe_target_health(
-                        TargetGroupArn=tg["TargetGroupArn"]
-                    )
-                    if any(
-                        t["TargetHealth"]["State"] == "healthy"
-                        for t in health["TargetHealthDescriptions"]
-                    ):
-                        has_healthy_targets = True
-                        break
-
-                if not has_healthy_targets:
-                    resources.append(
-                        UnusedResource(
-                            resource_type="Load Balancer",
-                            resource_id=lb_name,
-                            region=region,
-                            created=lb["CreatedTime"].replace(tzinfo=None),
-                            estimated_monthly_cost=22.0,
-                            details="No healthy targets",
-                        )
+            with ThreadPoolExecutor(max_workers=health_workers) as executor:
+                for lb in lbs:
+                    tg_pages = elbv2.get_paginator("describe_target_groups").paginate(
+                        LoadBalancerArn=lb["LoadBalancerArn"],
+                        PaginationConfig={"PageSize": 400},
                     )
+                    target_groups = [
+                        tg for page in tg_pages for tg in page["TargetGroups"]
+                    ]
+
+                    if not self._has_healthy_targets(elbv2, target_groups, executor):
+                        resources.append(self._load_balancer_resource(lb, region))
 
         except ClientError as e:
             logger.warning(f"Error checking load balancers in {region}: {e}")
 
         return resources
 
+    def _load_balancer_resource(self, lb: dict, region: str) -> UnusedResource:
+        """Build an UnusedResource from a describe_load_balancers entry."""
+        return UnusedResource(
+            resource_type="Load Balancer",
+            resource_id=lb["LoadBalancerName"],
+            region=region,
+            created=lb["CreatedTime"].replace(tzinfo=None),
+            estimated_monthly_cost=22.0,
+            details="No healthy targets",
+        )
+
+    def _is_healthy(self, health: dict) -> bool:
+        """Check a describe_target_health response for a healthy target."""
+        return any(
+            t["TargetHealth"]["State"] == "healthy"
+            for t in health["TargetHealthDescriptions"]
+        )
+
+    def _has_healthy_targets(
+        self,
+        elbv2,
+        target_groups: list[dict],
+        executor: ThreadPoolExecutor,
+    ) -> bool:
+        """Check target groups concurrently, stopping at the first healthy one."""
+        futures = [
+            executor.submit(
+                elbv2.describe_target_health,
+                TargetGroupArn=tg["TargetGroupArn"],
+            )
+            for tg in target_groups
+        ]
+        for future in as_completed(futures):
+            if self._is_healthy(future.result()):
+                for pending in futures:
+                    pending.cancel()
+                return True
+
+        return False
+
     def find_unused_elastic_ips(self, region: str) -> list[UnusedResource]:
         """Find Elastic IPs not associated with any instance."""
-        resources = []
-        ec2 = self.session.client("ec2", region_name=region)
+        ec2 = self._client("ec2", region)
 
         try:
-            addresses = ec2.describe_addresses()["Addresses"]
-
-            for addr in addresses:
-                if "InstanceId" not in addr and "NetworkInterfaceId" not in addr:
-                    resources.append(
-                        UnusedResource(
-                            resource_type="Elastic IP",
-                            resource_id=addr["PublicIp"],
-                            region=region,
-                            created=None,
-                            estimated_monthly_cost=3.60,
-                            details="Not associated",
-                        )
-                    )
-
+            addresses = ec2.describe_addresses(
+                Filters=[{"Name": "domain", "Values": ["vpc"]}]
+            )["Addresses"]
         except ClientError as e:
             logger.warning(f"Error checking Elastic IPs in {region}: {e}")
-
-        return resources
+            return []
+
+        return [
+            self._elastic_ip_resource(addr, region)
+            for addr in addresses
+            if "InstanceId" not in addr and "NetworkInterfaceId" not in addr
+        ]
+
+    def _elastic_ip_resource(self, addr: dict, region: str) -> UnusedResource:
+        """Build an UnusedResource from a describe_addresses entry."""
+        return UnusedResource(
+            resource_type="Elastic IP",
+            resource_id=addr["PublicIp"],
+            region=region,
+            created=None,
+            estimated_monthly_cost=3.60,
+            details="Not associated",
+        )
 
     def _estimate_ebs_cost(self, size_gb: int, vol_type: str) -> float:
         """Estimate monthly cost for EBS volume."""
-        rates = {
-            "gp2": 0.10,
-            "gp3": 0.08,
-            "io1": 0.125,
-            "io2": 0.125,
-            "st1": 0.045,
-            "sc1": 0.025,
-            "standard": 0.05,
-        }
-        return size_gb * rates.get(vol_type, 0.10)
-
-    def scan_all(self) -> list[UnusedResource]:
+        return size_gb * _EBS_RATES.get(vol_type, 0.10)
+
+    def scan_all(self, use_async: bool = False) -> list[UnusedResource]:
         """Scan all regions for unused resources."""
+        if use_async:
+            return asyncio.run(self.scan_all_async())
+
         self.unused_resources = []
+        finders = (
+            self.find_unattached_volumes,
+            self.find_idle_load_balancers,
+            self.find_unused_elastic_ips,
+        )
 
-        for region in self.regions:
-            console.print(f"Scanning {region}...", style="dim")
-            self.unused_resources.extend(self.find_unattached_volumes(region))
-            self.unused_resources.extend(self.find_idle_load_balancers(region))
-            self.unused_resources.extend(self.find_unused_elastic_ips(region))
+        console.print(f"Scanning {len(self.regions)} regions...", style="dim")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(find, region): region
+                for region in self.regions
+                for find in finders
+            }
+            remaining = {region: len(finders) for region in self.regions}
+
+            # Results are only collected here, in the calling thread.
+            for future in as_completed(futures):
+                self.unused_resources.extend(future.result())
+                region = futures[future]
+                remaining[region] -= 1
+                if not remaining[region]:
+                    console.print(f"Scanned {region}", style="dim")
 
         return self.unused_resources
 
+    @asynccontextmanager
+    async def _async_ec2_client(self, session, region: str):
+        """Open an aioboto3 EC2 client paced by the region's shared bucket."""
+        async with session.client("ec2", region_name=region) as ec2:
+            throttle_describe_calls_async(ec2, region_bucket(region))
+            yield ec2
+
+    async def _find_unattached_volumes_async(
+        self, session, region: str
+    ) -> list[UnusedResource]:
+        """Async variant of find_unattached_volumes."""
+        async with self._async_ec2_client(session, region) as ec2:
+            try:
+                pages = ec2.get_paginator("describe_volumes").paginate(
+                    Filters=[{"Name": "status", "Values": ["available"]}],
+                    PaginationConfig={"PageSize": 500},
+                )
+                return [
+                    self._volume_resource(vol, region)
+                    async for page in pages
+                    for vol in page["Volumes"]
+                ]
+            except ClientError as e:
+                logger.warning(f"Error checking volumes in {region}: {e}")
+                return []
+
+    async def _find_idle_load_balancers_async(
+        self, session, region: str
+    ) -> list[UnusedResource]:
+        """Async variant of find_idle_load_balancers."""
+        resources = []
+
+        async with session.client("elbv2", region_name=region) as elbv2:
+            try:
+                pages = elbv2.get_paginator("describe_load_balancers").paginate(
+                    PaginationConfig={"PageSize": 400}
+                )
+                async for page in pages:
+                    for lb in page["LoadBalancers"]:
+                        tg_pages = elbv2.get_paginator(
+                            "describe_target_groups"
+                        ).paginate(
+                            LoadBalancerArn=lb["LoadBalancerArn"],
+                            PaginationConfig={"PageSize": 400},
+                        )
+                        health = await asyncio.gather(
+                            *[
+                                elbv2.describe_target_health(
+                                    TargetGroupArn=tg["TargetGroupArn"]
+                                )
+                                async for tg_page in tg_pages
+                                for tg in tg_page["TargetGroups"]
+                            ]
+                        )
+                        if not any(self._is_healthy(h) for h in health):
+                            resources.append(self._load_balancer_resource(lb, region))
+            except ClientError as e:
+                logger.warning(f"Error checking load balancers in {region}: {e}")
+
+        return resources
+
+    async def _find_unused_elastic_ips_async(
+        self, session, region: str
+    ) -> list[UnusedResource]:
+        """Async variant of find_unused_elastic_ips."""
+        async with self._async_ec2_client(session, region) as ec2:
+            try:
+                response = await ec2.describe_addresses(
+                    Filters=[{"Name": "domain", "Values": ["vpc"]}]
+                )
+            except ClientError as e:
+                logger.warning(f"Error checking Elastic IPs in {region}: {e}")
+                return []
+
+        return [
+            self._elastic_ip_resource(addr, region)
+            for addr in response["Addresses"]
+            if "InstanceId" not in addr and "NetworkInterfaceId" not in addr
+        ]
+
+    async def scan_all_async(self) -> list[UnusedResource]:
+        """Scan all regions for unused resources on a single event loop."""
+        import aioboto3
+
+        session = aioboto3.Session()
+        finders = (
+            self._find_unattached_volumes_async,
+            self._find_idle_load_balancers_async,
+            self._find_unused_elastic_ips_async,
+        )
+
+        async def scan_region(region: str) -> list[UnusedResource]:
+            results = await asyncio.gather(*(find(session, region) for find in finders))
+            console.print(f"Scanned {region}", style="dim")
+            return [r for resources in results for r in resources]
+
+        console.print(f"Scanning {len(self.regions)} regions...", style="dim")
+        results = await asyncio.gather(*(scan_region(r) for r in self.regions))
+        self.unused_resources = [r for resources in results for r in resources]
+        return self.unused_resources
+
     def display_results(self) -> None:
         """Display results in a formatted table."""
         if not self.unused_resources:
             console.print("No unused resources found.", style="green")
             return
 
-        table = Table(title="Unused AWS Resources")
-        table.add_column("Type", style="cyan")
-        table.add_column("Resource ID", style="magenta")
-        table.add_column("Region", style="green")
-        table.add_column("Monthly Cost", style="red")
-        table.add_column("Details", style="dim")
-
-        total_cost = 0.0
-        for r in self.unused_resources:
-            table.add_row(
+        columns = [
+            ("Type", "cyan"),
+            ("Resource ID", "magenta"),
+            ("Region", "green"),
+            ("Monthly Cost", "red"),
+            ("Details", "dim"),
+        ]
+        rows = [
+            (
                 r.resource_type,
                 r.resource_id,
                 r.region,
                 f"${r.estimated_monthly_cost:.2f}",
                 r.details,
             )
-            total_cost += r.estimated_monthly_cost
+            for r in self.unused_resources
+        ]
+        total_cost = sum(r.estimated_monthly_cost for r in self.unused_resources)
+
+        if len(rows) > PLAIN_ROW_THRESHOLD:
+            write_plain_table([name for name, _ in columns], rows)
+        else:
+            table = Table(title="Unused AWS Resources")
+            for name, style in columns:
+                table.add_column(name, style=style)
+            for row in rows:
+                table.add_row(*row)
+            console.print(table)
 
-        console.print(table)
         console.print(
             f"\nTotal estimated monthly savings: ${total_cost:.2f}",
             style="bold green",
@@ -205,11 +410,28 @@ class UnusedResourceFinder:
 
 @click.command()
 @click.option("--region", "-r", help="AWS region (default: all regions)")
-def main(region: Optional[str]) -> None:
+@click.option("--regions", help="Comma-separated list of AWS regions")
+@click.option(
+    "--max-workers", default=16, help="Number of concurrent region scans"
+)
+@click.option(
+    "--async", "use_async", is_flag=True, help="Scan with aioboto3 on an event loop"
+)
+def main(
+    region: Optional[str],
+    regions: Optional[str],
+    max_workers: int,
+    use_async: bool,
+) -> None:
     """Find unused AWS resources for cost optimization."""
-    regions = [region] if region else None
-    finder = UnusedResourceFinder(regions=regions)
-    finder.scan_all()
+    selected = [r.strip() for r in (regions or "").split(",") if r.strip()]
+    if region:
+        selected.insert(0, region)
+    finder = UnusedResourceFinder(
+        regions=list(dict.fromkeys(selected)) or None,
+        max_workers=max_workers,
+    )
+    finder.scan_all(use_async=use_async)
     finder.display_results()
 
 
@@ -4,9 +4,11 @@ Removes dangling images, old tagged images, and unused containers.
 """
 
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Callable, Optional
 
 import click
 import docker
@@ -14,12 +16,14 @@ from docker.errors import APIError
 from rich.console import Console
 from rich.table import Table
 
+from utils.output import PLAIN_ROW_THRESHOLD, write_plain_table
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 console = Console()
 
 
-@dataclass
+@dataclass(slots=True)
 class ImageInfo:
     """Docker image information."""
 
@@ -41,12 +45,33 @@ class DockerImageCleaner:
             logger.error(f"Failed to connect to Docker: {e}")
             raise
 
+    def _image_info(self, img, now: datetime) -> ImageInfo:
+        """Build ImageInfo from a Docker image object."""
+        created_str = img.attrs.get("Created", "")
+        if created_str:
+            created = datetime.fromisoformat(created_str.replace("Z", "+00:00"))
+        else:
+            created = now
+
+        age = now - created
+        size_mb = img.attrs.get("Size", 0) / (1024 * 1024)
+        tags = img.tags if img.tags else ["<none>:<none>"]
+
+        return ImageInfo(
+            image_id=img.short_id.replace("sha256:", ""),
+            tags=tags,
+            size_mb=size_mb,
+            created=created,
+            age_days=age.total_seconds() / 86400,
+        )
+
     def list_images(
         self,
         min_age_days: int = 0,
         include_dangling: bool = True,
+        sort: bool = True,
     ) -> list[ImageInfo]:
-        """List all images with their information."""
+        """List all images with their information, oldest first if sorted."""
         images_info = []
 
         try:
@@ -55,62 +80,71 @@ class DockerImageCleaner:
             logger.error(f"Failed to list images: {e}")
             return images_info
 
+        now = datetime.now(timezone.utc)
         for img in images:
-            created_str = img.attrs.get("Created", "")
-            if created_str:
-                created = datetime.fromisoformat(
-                    created_str.replace("Z", "+00:00")
-                )
-            else:
-                created = datetime.now(timezone.utc)
-
-            age = datetime.now(timezone.utc) - created
-            age_days = age.total_seconds() / 86400
-
-            if age_days < min_age_days:
+            info = self._image_info(img, now)
+            if info.age_days < min_age_days:
                 continue
+            images_info.append(info)
 
-            size_mb = img.attrs.get("Size", 0) / (1024 * 1024)
-            tags = img.tags if img.tags else ["<none>:<none>"]
-
-            images_info.append(
-                ImageInfo(
-                    image_id=img.short_id.replace("sha256:", ""),
-                    tags=tags,
-                    size_mb=size_mb,
-                    created=created,
-                    age_days=age_days,
-                )
-            )
-
+        if not sort:
+            return images_info
         return sorted(images_info, key=lambda x: x.age_days, reverse=True)
 
-    def get_dangling_images(self) -> list[ImageInfo]:
-        """Get dangling (untagged) images."""
-        all_images = self.list_images()
-        return [img for img in all_images if img.tags == ["<none>:<none>"]]
+    def get_dangling_images(self, sort: bool = True) -> list[ImageInfo]:
+        """Get dangling (untagged) images, filtered by the daemon."""
+        try:
+            images = self.client.images.list(filters={"dangling": True})
+        except APIError as e:
+            logger.error(f"Failed to list dangling images: {e}")
+            return []
+
+        now = datetime.now(timezone.utc)
+        dangling = [self._image_info(img, now) for img in images]
+        if not sort:
+            return dangling
+        return sorted(dangling, key=lambda x: x.age_days, reverse=True)
+
+    def _remove_one(self, img: ImageInfo, label: str) -> tuple[bool, float]:
+        """Remove a single image, returning (removed, freed MB)."""
+        try:
+            self.client.images.remove(img.image_id, force=True)
+        except APIError as e:
+            logger.warning(f"Failed to remove {label}: {e}")
+            return False, 0.0
+
+        console.print(f"Removed: {label}")
+        return True, img.size_mb
+
+    def _remove_images(
+        self,
+        images: list[ImageInfo],
+        label: Callable[[ImageInfo], str],
+        max_workers: int = 8,
+    ) -> tuple[int, float]:
+        """Remove images concurrently and total up the results."""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(lambda img: self._remove_one(img, label(img)), images)
+            )
+
+        removed_count = sum(1 for removed, _ in results if removed)
+        freed_mb = sum(size_mb for _, size_mb in results)
+        return removed_count, freed_mb
 
     def cleanup_dangling(self, dry_run: bool = True) -> tuple[int, float]:
         """Remove dangling images."""
-        dangling = self.get_dangling_images()
-        removed_count = 0
-        freed_mb = 0.0
+        dangling = self.get_dangling_images(sort=False)
+
+        if not dry_run:
+            return self._remove_images(dangling, label=lambda img: img.image_id)
 
         for img in dangling:
-            if dry_run:
-                console.print(
-                    f"[DRY RUN] Would remove: {img.image_id} ({img.size_mb:.1f}MB)"
-                )
-            else:
-                try:
-                    self.client.images.remove(img.image_id, force=True)
-                    console.print(f"Removed: {img.image_id}")
-                    removed_count += 1
-                    freed_mb += img.size_mb
-                except APIError as e:
-                    logger.warning(f"Failed to remove {img.image_id}: {e}")
+            console.print(
+                f"[DRY RUN] Would remove: {img.image_id} ({img.size_mb:.1f}MB)"
+            )
 
-        return removed_count, freed_mb
+        return 0, 0.0
 
     def cleanup_old_images(
         self,
@@ -118,35 +152,85 @@ class DockerImageCleaner:
         keep_tags: Optional[list[str]] = None,
         dry_run: bool = True,
     ) -> tuple[int, float]:
-        """Remove images older than specified days."""
-        old_images = self.list_images(min_age_days=min_age_days)
-        keep_tags = keep_tags or ["latest", "stable", "production"]
-        removed_count = 0
-        freed_mb = 0.0
+        """Remove images older than specified days.
 
-        for img in old_images:
-            should_keep = any(
-                any(keep in tag for keep in keep_tags) for tag in img.tags
+        When no old image is kept by tag or used by a container, removal is
+        done with a daemon-side prune; otherwise images are force-removed
+        one by one.
+        """
+        old_images = self.list_images(min_age_days=min_age_days, sort=False)
+        keep_tags = keep_tags or ["latest", "stable", "production"]
+        keep_re = re.compile("|".join(re.escape(keep) for keep in keep_tags))
+        to_remove = [
+            img
+            for img in old_images
+            if not any(keep_re.search(tag) for tag in img.tags)
+        ]
+
+        if not dry_run:
+            # Prune cannot filter on tags and skips images referenced by any
+            # container, so only hand the work to the daemon when it would
+            # remove exactly what the dry run lists.
+            if (
+                to_remove
+                and len(to_remove) == len(old_images)
+                and not self._any_in_use(to_remove)
+            ):
+                return self._prune_older_than(min_age_days, to_remove)
+            return self._remove_images(to_remove, label=lambda img: img.tags[0])
+
+        for img in to_remove:
+            console.print(
+                f"[DRY RUN] Would remove: {img.tags[0]} "
+                f"({img.size_mb:.1f}MB, {img.age_days:.0f} days old)"
             )
 
-            if should_keep:
-                continue
+        return 0, 0.0
 
-            if dry_run:
-                console.print(
-                    f"[DRY RUN] Would remove: {img.tags[0]} "
-                    f"({img.size_mb:.1f}MB, {img.age_days:.0f} days old)"
-                )
-            else:
-                try:
-                    self.client.images.remove(img.image_id, force=True)
-                    console.print(f"Removed: {img.tags[0]}")
-                    removed_count += 1
-                    freed_mb += img.size_mb
-                except APIError as e:
-                    logger.warning(f"Failed to remove {img.tags[0]}: {e}")
+    def _any_in_use(self, images: list[ImageInfo]) -> bool:
+        """Check whether any image is used by a container, running or stopped."""
+        try:
+            containers = self.client.containers.list(all=True, sparse=True)
+        except APIError as e:
+            logger.warning(f"Failed to list containers: {e}")
+            return True
+
+        used = {
+            (c.attrs.get("ImageID") or "").replace("sha256:", "") for c in containers
+        }
+        return any(
+            image_id.startswith(img.image_id) for img in images for image_id in used
+        )
 
-        return removed_count, freed_mb
+    def _prune_older_than(
+        self, min_age_days: int, images: list[ImageInfo]
+    ) -> tuple[int, float]:
+        """Prune unused images older than min_age_days on the daemon side."""
+        try:
+            result = self.client.images.prune(
+                filters={"until": f"{min_age_days * 24}h", "dangling": False}
+            )
+        except APIError as e:
+            logger.error(f"Prune failed: {e}")
+            return 0, 0.0
+
+        # ImagesDeleted also lists every removed layer and parent, so count
+        # only the entries that match the images we meant to remove.
+        deleted = [
+            entry["Deleted"].replace("sha256:", "")
+            for entry in result.get("ImagesDeleted") or []
+            if "Deleted" in entry
+        ]
+        removed = [
+            img
+            for img in images
+            if any(image_id.startswith(img.image_id) for image_id in deleted)
+        ]
+        for img in removed:
+            console.print(f"Removed: {img.tags[0]}")
+
+        freed_mb = (result.get("SpaceReclaimed") or 0) / (1024 * 1024)
+        return len(removed), freed_mb
 
     def prune_system(self, dry_run: bool = True) -> dict:
         """Prune unused Docker objects."""
@@ -168,23 +252,35 @@ class DockerImageCleaner:
 
     def display_images(self, images: list[ImageInfo]) -> None:
         """Display images in a table."""
-        table = Table(title="Docker Images")
-        table.add_column("Image ID", style="cyan")
-        table.add_column("Tags", style="magenta")
-        table.add_column("Size", style="green")
-        table.add_column("Age (days)", style="yellow")
-
-        total_size = 0.0
-        for img in images:
-            table.add_row(
+        columns = [
+            ("Image ID", "cyan"),
+            ("Tags", "magenta"),
+            ("Size", "green"),
+            ("Age (days)", "yellow"),
+        ]
+        plain = len(images) > PLAIN_ROW_THRESHOLD
+        tag_sep = ", " if plain else "\n"
+        rows = [
+            (
                 img.image_id,
-                "\n".join(img.tags[:2]),
+                tag_sep.join(img.tags[:2]),
                 f"{img.size_mb:.1f}MB",
                 f"{img.age_days:.0f}",
             )
-            total_size += img.size_mb
+            for img in images
+        ]
+        total_size = sum(img.size_mb for img in images)
+
+        if plain:
+            write_plain_table([name for name, _ in columns], rows)
+        else:
+            table = Table(title="Docker Images")
+            for name, style in columns:
+                table.add_column(name, style=style)
+            for row in rows:
+                table.add_row(*row)
+            console.print(table)
 
-        console.print(table)
         console.print(f"\nTotal: {len(images)} images, {total_size / 1024:.2f}GB")
 
 
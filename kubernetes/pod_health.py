@@ -9,17 +9,20 @@ from datetime import datetime, timezone
 from typing import Optional
 
 import click
+import orjson
 from kubernetes import client, config
 from kubernetes.client.exceptions import ApiException
 from rich.console import Console
 from rich.table import Table
 
+from utils.output import PLAIN_ROW_THRESHOLD, write_plain_table
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 console = Console()
 
 
-@dataclass
+@dataclass(slots=True)
 class PodHealthInfo:
     """Pod health information."""
 
@@ -52,53 +55,86 @@ class PodHealthChecker:
         self.v1 = client.CoreV1Api()
         self.apps_v1 = client.AppsV1Api()
 
+    def _list_pods(
+        self,
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        page_size: int = 500,
+    ) -> list[dict]:
+        """List pods as raw dicts, following continue tokens."""
+        items = []
+        continue_token = None
+
+        while True:
+            kwargs = {
+                "label_selector": label_selector,
+                "limit": page_size,
+                "_continue": continue_token,
+                # Skip the openapi model layer and decode the JSON directly.
+                "_preload_content": False,
+            }
+            if namespace:
+                response = self.v1.list_namespaced_pod(namespace=namespace, **kwargs)
+            else:
+                response = self.v1.list_pod_for_all_namespaces(**kwargs)
+
+            pods = orjson.loads(response.data)
+            items.extend(pods.get("items") or [])
+            continue_token = pods.get("metadata", {}).get("continue")
+            if not continue_token:
+                return items
+
     def get_pod_health(
         self,
         namespace: Optional[str] = None,
         label_selector: Optional[str] = None,
+        unhealthy_only: bool = False,
     ) -> list[PodHealthInfo]:
-        """Get health information for pods."""
+        """Get health information for pods, optionally skipping healthy ones."""
         pods_info = []
 
         try:
-            if namespace:
-                pods = self.v1.list_namespaced_pod(
-                    namespace=namespace,
-                    label_selector=label_selector,
-                )
-            else:
-                pods = self.v1.list_pod_for_all_namespaces(
-                    label_selector=label_selector,
-                )
+            pods = self._list_pods(namespace, label_selector=label_selector)
         except ApiException as e:
             logger.error(f"Failed to list pods: {e}")
             return pods_info
 
-        for pod in pods.items:
+        now = datetime.now(timezone.utc)
+        for pod in pods:
+            metadata = pod.get("metadata") or {}
+            status = pod.get("status") or {}
+            spec = pod.get("spec") or {}
+
             issues = self._analyze_pod(pod)
+            if unhealthy_only and not issues and status.get("phase") == "Running":
+                continue
+
             restarts = sum(
-                cs.restart_count
-                for cs in (pod.status.container_statuses or [])
+                cs.get("restartCount", 0)
+                for cs in (status.get("containerStatuses") or [])
             )
 
             age_hours = 0.0
-            if pod.status.start_time:
-                age = datetime.now(timezone.utc) - pod.status.start_time
+            start_time = status.get("startTime")
+            if start_time:
+                started = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
+                age = now - started
                 age_hours = age.total_seconds() / 3600
 
             cpu_req = "N/A"
             mem_req = "N/A"
-            if pod.spec.containers:
-                resources = pod.spec.containers[0].resources
-                if resources and resources.requests:
-                    cpu_req = resources.requests.get("cpu", "N/A")
-                    mem_req = resources.requests.get("memory", "N/A")
+            containers = spec.get("containers") or []
+            if containers:
+                requests = (containers[0].get("resources") or {}).get("requests")
+                if requests:
+                    cpu_req = requests.get("cpu", "N/A")
+                    mem_req = requests.get("memory", "N/A")
 
             pods_info.append(
                 PodHealthInfo(
-                    name=pod.metadata.name,
-                    namespace=pod.metadata.namespace,
-                    status=pod.status.phase,
+                    name=metadata.get("name"),
+                    namespace=metadata.get("namespace"),
+                    status=status.get("phase"),
                     restarts=restarts,
                     age_hours=age_hours,
                     cpu_request=cpu_req,
@@ -109,33 +145,39 @@ class PodHealthChecker:
 
         return pods_info
 
-    def _analyze_pod(self, pod) -> list[str]:
+    def _analyze_pod(self, pod: dict) -> list[str]:
         """Analyze pod for potential issues."""
         issues = []
+        status = pod.get("status") or {}
+        phase = status.get("phase")
 
-        if pod.status.phase in ("Failed", "Unknown"):
-            issues.append(f"Pod in {pod.status.phase} state")
+        if phase in ("Failed", "Unknown"):
+            issues.append(f"Pod in {phase} state")
 
-        for cs in pod.status.container_statuses or []:
-            if cs.restart_count > 5:
-                issues.append(f"High restart count: {cs.restart_count}")
+        for cs in status.get("containerStatuses") or []:
+            restart_count = cs.get("restartCount", 0)
+            if restart_count > 5:
+                issues.append(f"High restart count: {restart_count}")
 
-            if cs.state.waiting:
-                reason = cs.state.waiting.reason
+            state = cs.get("state") or {}
+            waiting = state.get("waiting")
+            if waiting:
+                reason = waiting.get("reason")
                 if reason in ("CrashLoopBackOff", "ImagePullBackOff", "ErrImagePull"):
                     issues.append(f"Container waiting: {reason}")
 
-            if cs.state.terminated:
-                if cs.state.terminated.exit_code != 0:
-                    issues.append(
-                        f"Container exited with code {cs.state.terminated.exit_code}"
-                    )
+            terminated = state.get("terminated")
+            if terminated:
+                exit_code = terminated.get("exitCode")
+                if exit_code != 0:
+                    issues.append(f"Container exited with code {exit_code}")
 
-        for cond in pod.status.conditions or []:
-            if cond.type == "Ready" and cond.status != "True":
-                issues.append(f"Not ready: {cond.reason}")
-            if cond.type == "PodScheduled" and cond.status != "True":
-                issues.append(f"Scheduling issue: {cond.reason}")
+        for cond in status.get("conditions") or []:
+            cond_type = cond.get("type")
+            if cond_type == "Ready" and cond.get("status") != "True":
+                issues.append(f"Not ready: {cond.get('reason')}")
+            if cond_type == "PodScheduled" and cond.get("status") != "True":
+                issues.append(f"Scheduling issue: {cond.get('reason')}")
 
         return issues
 
@@ -144,8 +186,7 @@ class PodHealthChecker:
         namespace: Optional[str] = None,
     ) -> list[PodHealthInfo]:
         """Get only unhealthy pods."""
-        all_pods = self.get_pod_health(namespace=namespace)
-        return [p for p in all_pods if p.issues or p.status != "Running"]
+        return self.get_pod_health(namespace=namespace, unhealthy_only=True)
 
     def display_health_report(
         self,
@@ -153,40 +194,62 @@ class PodHealthChecker:
         show_healthy: bool = False,
     ) -> None:
         """Display pod health in a table."""
-        if show_healthy:
-            display_pods = pods
-        else:
-            display_pods = [p for p in pods if p.issues or p.status != "Running"]
+        healthy = 0
+        unhealthy = 0
+        display_pods = []
+        for pod in pods:
+            if not pod.issues and pod.status == "Running":
+                healthy += 1
+                if not show_healthy:
+                    continue
+            else:
+                unhealthy += 1
+            display_pods.append(pod)
 
         if not display_pods:
             console.print("All pods are healthy.", style="green")
             return
 
-        table = Table(title="Pod Health Report")
-        table.add_column("Namespace", style="cyan")
-        table.add_column("Pod", style="magenta")
-        table.add_column("Status", style="green")
-        table.add_column("Restarts", style="yellow")
-        table.add_column("Age (h)", style="dim")
-        table.add_column("Issues", style="red")
+        columns = [
+            ("Namespace", "cyan"),
+            ("Pod", "magenta"),
+            ("Status", "green"),
+            ("Restarts", "yellow"),
+            ("Age (h)", "dim"),
+            ("Issues", "red"),
+        ]
+        plain = len(display_pods) > PLAIN_ROW_THRESHOLD
+        rows = []
 
         for pod in display_pods:
-            status_style = "green" if pod.status == "Running" else "red"
+            if plain:
+                status_str = pod.status
+            else:
+                status_style = "green" if pod.status == "Running" else "red"
+                status_str = f"[{status_style}]{pod.status}[/{status_style}]"
             issues_str = "; ".join(pod.issues) if pod.issues else "-"
 
-            table.add_row(
-                pod.namespace,
-                pod.name[:40],
-                f"[{status_style}]{pod.status}[/{status_style}]",
-                str(pod.restarts),
-                f"{pod.age_hours:.1f}",
-                issues_str,
+            rows.append(
+                (
+                    pod.namespace,
+                    pod.name[:40],
+                    status_str,
+                    str(pod.restarts),
+                    f"{pod.age_hours:.1f}",
+                    issues_str,
+                )
             )
 
-        console.print(table)
+        if plain:
+            write_plain_table([name for name, _ in columns], rows)
+        else:
+            table = Table(title="Pod Health Report")
+            for name, style in columns:
+                table.add_column(name, style=style)
+            for row in rows:
+                table.add_row(*row)
+            console.print(table)
 
-        healthy = len([p for p in pods if not p.issues and p.status == "Running"])
-        unhealthy = len(pods) - healthy
         console.print(
             f"\nTotal: {len(pods)} pods | Healthy: {healthy} | Issues: {unhealthy}"
         )
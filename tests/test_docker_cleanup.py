@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
+from docker.errors import APIError
 
 from docker.image_cleanup import DockerImageCleaner, ImageInfo
 
@@ -61,6 +62,9 @@ class TestDockerImageCleaner:
 
         assert len(dangling) == 1
         assert dangling[0].tags == ["<none>:<none>"]
+        mock_client.images.list.assert_called_once_with(
+            filters={"dangling": True}
+        )
 
     @patch("docker.image_cleanup.docker")
     def test_cleanup_dry_run(self, mock_docker):
@@ -84,3 +88,94 @@ class TestDockerImageCleaner:
         assert freed == 0.0
         mock_client.images.remove.assert_not_called()
 
+    @patch("docker.image_cleanup.docker")
+    def test_cleanup_removes_concurrently(self, mock_docker):
+        """Test removal results are totalled and failures skipped."""
+        mock_client = MagicMock()
+        mock_docker.from_env.return_value = mock_client
+
+        images = []
+        for image_id in ("sha256:aaa111", "sha256:bbb222"):
+            mock_image = MagicMock()
+            mock_image.short_id = image_id
+            mock_image.tags = []
+            mock_image.attrs = {
+                "Created": "2025-01-01T00:00:00Z",
+                "Size": 100 * 1024 * 1024,
+            }
+            images.append(mock_image)
+        mock_client.images.list.return_value = images
+
+        def remove(image_id, force):
+            if image_id == "bbb222":
+                raise APIError("in use")
+
+        mock_client.images.remove.side_effect = remove
+
+        cleaner = DockerImageCleaner()
+        count, freed = cleaner.cleanup_dangling(dry_run=False)
+
+        assert count == 1
+        assert freed == 100.0
+        assert mock_client.images.remove.call_count == 2
+
+    @patch("docker.image_cleanup.docker")
+    def test_cleanup_old_images_prunes_on_daemon(self, mock_docker):
+        """Test old images are pruned by the daemon when none are kept."""
+        mock_client = MagicMock()
+        mock_docker.from_env.return_value = mock_client
+
+        mock_image = MagicMock()
+        mock_image.short_id = "sha256:abc123"
+        mock_image.tags = ["myapp:v1"]
+        mock_image.attrs = {
+            "Created": "2025-01-01T00:00:00Z",
+            "Size": 100 * 1024 * 1024,
+        }
+        mock_client.images.list.return_value = [mock_image]
+        mock_client.containers.list.return_value = []
+        mock_client.images.prune.return_value = {
+            "ImagesDeleted": [
+                {"Untagged": "myapp:v1"},
+                {"Deleted": "sha256:abc123" + "0" * 58},
+                {"Deleted": "sha256:" + "1" * 64},
+                {"Deleted": "sha256:" + "2" * 64},
+            ],
+            "SpaceReclaimed": 100 * 1024 * 1024,
+        }
+
+        cleaner = DockerImageCleaner()
+        count, freed = cleaner.cleanup_old_images(min_age_days=30, dry_run=False)
+
+        assert count == 1
+        assert freed == 100.0
+        mock_client.images.prune.assert_called_once_with(
+            filters={"until": "720h", "dangling": False}
+        )
+        mock_client.images.remove.assert_not_called()
+
+    @patch("docker.image_cleanup.docker")
+    def test_cleanup_old_images_skips_prune_for_used_images(self, mock_docker):
+        """Test images used by a stopped container are force-removed instead."""
+        mock_client = MagicMock()
+        mock_docker.from_env.return_value = mock_client
+
+        mock_image = MagicMock()
+        mock_image.short_id = "sha256:abc123"
+        mock_image.tags = ["myapp:v1"]
+        mock_image.attrs = {
+            "Created": "2025-01-01T00:00:00Z",
+            "Size": 100 * 1024 * 1024,
+        }
+        mock_client.images.list.return_value = [mock_image]
+        stopped = MagicMock()
+        stopped.attrs = {"ImageID": "sha256:abc123" + "0" * 58}
+        mock_client.containers.list.return_value = [stopped]
+
+        cleaner = DockerImageCleaner()
+        count, freed = cleaner.cleanup_old_images(min_age_days=30, dry_run=False)
+
+        assert count == 1
+        assert freed == 100.0
+        mock_client.images.prune.assert_not_called()
+        mock_client.images.remove.assert_called_once_with("abc123", force=True)
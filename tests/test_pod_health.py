@@ -0,0 +1,141 @@
+"""Tests for Kubernetes pod health checker."""
+
+from unittest.mock import MagicMock, patch
+
+import orjson
+
+from kubernetes.pod_health import PodHealthChecker
+
+
+def make_response(items, continue_token=None):
+    """Build a raw pod list response as returned with _preload_content=False."""
+    response = MagicMock()
+    response.data = orjson.dumps(
+        {"metadata": {"continue": continue_token}, "items": items}
+    )
+    return response
+
+
+def make_pod(name, namespace="default", phase="Running", **status):
+    """Build a minimal pod dict in API (camelCase) form."""
+    return {
+        "metadata": {"name": name, "namespace": namespace},
+        "spec": {"containers": [{"resources": {}}]},
+        "status": {"phase": phase, **status},
+    }
+
+
+class TestPodHealthChecker:
+    """Tests for PodHealthChecker class."""
+
+    @patch("kubernetes.pod_health.config")
+    @patch("kubernetes.pod_health.client")
+    def test_all_namespaces_follows_continue_token(self, mock_client, mock_config):
+        """Test cluster-wide listing pages without listing namespaces."""
+        v1 = mock_client.CoreV1Api.return_value
+        v1.list_pod_for_all_namespaces.side_effect = [
+            make_response([make_pod("a", namespace="ns1")], continue_token="next"),
+            make_response([make_pod("b", namespace="ns2")]),
+        ]
+
+        checker = PodHealthChecker()
+        pods = checker.get_pod_health()
+
+        assert [p.name for p in pods] == ["a", "b"]
+        assert v1.list_pod_for_all_namespaces.call_count == 2
+        second_call = v1.list_pod_for_all_namespaces.call_args_list[1]
+        assert second_call.kwargs["_continue"] == "next"
+        assert second_call.kwargs["limit"] == 500
+        v1.list_namespace.assert_not_called()
+
+    @patch("kubernetes.pod_health.config")
+    @patch("kubernetes.pod_health.client")
+    def test_namespaced_pods_are_parsed_from_raw_json(self, mock_client, mock_config):
+        """Test issues, restarts and requests are read from camelCase keys."""
+        crashing = make_pod(
+            "crashing",
+            startTime="2025-01-01T00:00:00Z",
+            containerStatuses=[
+                {
+                    "restartCount": 7,
+                    "state": {"waiting": {"reason": "CrashLoopBackOff"}},
+                }
+            ],
+            conditions=[
+                {"type": "Ready", "status": "False", "reason": "ContainersNotReady"}
+            ],
+        )
+        crashing["spec"]["containers"][0]["resources"] = {
+            "requests": {"cpu": "100m", "memory": "128Mi"}
+        }
+        failed = make_pod(
+            "failed",
+            phase="Failed",
+            containerStatuses=[
+                {"restartCount": 0, "state": {"terminated": {"exitCode": 137}}}
+            ],
+            conditions=[
+                {"type": "PodScheduled", "status": "False", "reason": "Unschedulable"}
+            ],
+        )
+        healthy = make_pod(
+            "healthy",
+            containerStatuses=[{"restartCount": 1, "state": {"running": {}}}],
+            conditions=[{"type": "Ready", "status": "True"}],
+        )
+
+        v1 = mock_client.CoreV1Api.return_value
+        v1.list_namespaced_pod.side_effect = [
+            make_response([crashing, failed], continue_token="next"),
+            make_response([healthy]),
+        ]
+
+        checker = PodHealthChecker()
+        pods = {p.name: p for p in checker.get_pod_health(namespace="default")}
+
+        assert v1.list_namespaced_pod.call_count == 2
+        assert v1.list_namespaced_pod.call_args_list[1].kwargs["_continue"] == "next"
+
+        assert pods["crashing"].restarts == 7
+        assert pods["crashing"].age_hours > 0
+        assert pods["crashing"].cpu_request == "100m"
+        assert pods["crashing"].memory_request == "128Mi"
+        assert pods["crashing"].issues == [
+            "High restart count: 7",
+            "Container waiting: CrashLoopBackOff",
+            "Not ready: ContainersNotReady",
+        ]
+
+        assert pods["failed"].status == "Failed"
+        assert pods["failed"].issues == [
+            "Pod in Failed state",
+            "Container exited with code 137",
+            "Scheduling issue: Unschedulable",
+        ]
+
+        assert pods["healthy"].restarts == 1
+        assert pods["healthy"].cpu_request == "N/A"
+        assert pods["healthy"].issues == []
+
+    @patch("kubernetes.pod_health.config")
+    @patch("kubernetes.pod_health.client")
+    def test_get_unhealthy_pods_skips_healthy(self, mock_client, mock_config):
+        """Test the unhealthy_only path drops healthy running pods."""
+        v1 = mock_client.CoreV1Api.return_value
+        v1.list_namespaced_pod.return_value = make_response(
+            [
+                make_pod("healthy"),
+                make_pod("pending", phase="Pending"),
+                make_pod(
+                    "restarting",
+                    containerStatuses=[
+                        {"restartCount": 9, "state": {"running": {}}}
+                    ],
+                ),
+            ]
+        )
+
+        checker = PodHealthChecker()
+        unhealthy = checker.get_unhealthy_pods(namespace="default")
+
+        assert [p.name for p in unhealthy] == ["pending", "restarting"]
@@ -0,0 +1,21 @@
+"""Tests for AWS API throttling helpers."""
+
+from utils.throttle import TokenBucket, region_bucket
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket class."""
+
+    def test_acquire_within_capacity_does_not_block(self):
+        """Test tokens up to capacity are handed out immediately."""
+        bucket = TokenBucket(rate=1000.0, capacity=3)
+
+        for _ in range(3):
+            bucket.acquire()
+
+        assert bucket._tokens < 1
+
+    def test_region_bucket_is_shared(self):
+        """Test every caller in a region gets the same bucket."""
+        assert region_bucket("eu-west-1") is region_bucket("eu-west-1")
+        assert region_bucket("eu-west-1") is not region_bucket("eu-west-2")
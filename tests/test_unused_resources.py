@@ -0,0 +1,281 @@
+"""Tests for unused AWS resource finder."""
+
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aioboto3
+from botocore.stub import Stubber
+
+from aws.unused_resources import UnusedResourceFinder
+
+AVAILABLE_FILTER = [{"Name": "status", "Values": ["available"]}]
+
+
+def make_volume(volume_id, size=10, volume_type="gp3"):
+    """Build a describe_volumes entry."""
+    return {
+        "VolumeId": volume_id,
+        "Size": size,
+        "VolumeType": volume_type,
+        "CreateTime": datetime(2025, 1, 1, tzinfo=timezone.utc),
+    }
+
+
+class TestUnusedResourceFinder:
+    """Tests for UnusedResourceFinder class."""
+
+    def test_find_unattached_volumes_throttles_each_page(self, monkeypatch):
+        """Test every volume page takes a token from the region bucket."""
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+
+        finder = UnusedResourceFinder(regions=["us-east-1"])
+
+        with patch("utils.throttle.TokenBucket.acquire") as acquire:
+            ec2 = finder._client("ec2", "us-east-1")
+            with Stubber(ec2) as stubber:
+                stubber.add_response(
+                    "describe_volumes",
+                    {"Volumes": [make_volume("vol-1")], "NextToken": "page-2"},
+                    {"Filters": AVAILABLE_FILTER, "MaxResults": 500},
+                )
+                stubber.add_response(
+                    "describe_volumes",
+                    {"Volumes": [make_volume("vol-2", volume_type="gp2")]},
+                    {
+                        "Filters": AVAILABLE_FILTER,
+                        "MaxResults": 500,
+                        "NextToken": "page-2",
+                    },
+                )
+
+                resources = finder.find_unattached_volumes("us-east-1")
+                stubber.assert_no_pending_responses()
+
+        assert [r.resource_id for r in resources] == ["vol-1", "vol-2"]
+        assert [r.estimated_monthly_cost for r in resources] == [0.8, 1.0]
+        # One token per page, taken in the botocore request hook.
+        assert acquire.call_count == 2
+
+    def test_async_ec2_calls_are_throttled(self, monkeypatch):
+        """Test every async EC2 describe page awaits a token from the bucket."""
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+
+        finder = UnusedResourceFinder(regions=["us-east-1"])
+        session = StubbedAioSession(
+            [
+                (
+                    "describe_volumes",
+                    {"Volumes": [make_volume("vol-1")], "NextToken": "page-2"},
+                    {"Filters": AVAILABLE_FILTER, "MaxResults": 500},
+                ),
+                (
+                    "describe_volumes",
+                    {"Volumes": [make_volume("vol-2")]},
+                    {
+                        "Filters": AVAILABLE_FILTER,
+                        "MaxResults": 500,
+                        "NextToken": "page-2",
+                    },
+                ),
+            ],
+            [
+                (
+                    "describe_addresses",
+                    {"Addresses": [{"PublicIp": "198.51.100.1"}]},
+                    {"Filters": [{"Name": "domain", "Values": ["vpc"]}]},
+                ),
+            ],
+        )
+
+        async def scan():
+            volumes = await finder._find_unattached_volumes_async(
+                session, "us-east-1"
+            )
+            eips = await finder._find_unused_elastic_ips_async(session, "us-east-1")
+            return volumes + eips
+
+        with patch(
+            "utils.throttle.TokenBucket.acquire_async", new_callable=AsyncMock
+        ) as acquire:
+            resources = asyncio.run(scan())
+
+        assert [r.resource_id for r in resources] == [
+            "vol-1",
+            "vol-2",
+            "198.51.100.1",
+        ]
+        assert acquire.await_count == 3
+
+    def test_async_scan_matches_threaded_scan(self, monkeypatch):
+        """Test scan_all(use_async=True) returns the same records as threads."""
+        monkeypatch.setitem(sys.modules, "aioboto3", FakeAioboto3(SCAN_DATA))
+
+        finder = UnusedResourceFinder(regions=["us-east-1", "eu-west-1"])
+        clients = {}
+
+        def fake_client(service, region):
+            return clients.setdefault((service, region), FakeClient(SCAN_DATA))
+
+        monkeypatch.setattr(finder, "_client", fake_client)
+
+        threaded = sorted(finder.scan_all(), key=record_key)
+        async_ = sorted(finder.scan_all(use_async=True), key=record_key)
+
+        assert threaded == async_
+        assert sorted((r.resource_type, r.resource_id) for r in threaded) == [
+            ("EBS Volume", "vol-1"),
+            ("EBS Volume", "vol-1"),
+            ("EBS Volume", "vol-2"),
+            ("EBS Volume", "vol-2"),
+            ("Elastic IP", "198.51.100.1"),
+            ("Elastic IP", "198.51.100.1"),
+            ("Load Balancer", "idle-lb"),
+            ("Load Balancer", "idle-lb"),
+        ]
+
+
+class StubbedAioSession:
+    """aioboto3 session whose clients answer from a botocore Stubber.
+
+    Each client opened takes the next list of canned responses.
+    """
+
+    def __init__(self, *responses_per_client):
+        self.responses_per_client = list(responses_per_client)
+
+    @asynccontextmanager
+    async def client(self, service, region_name):
+        session = aioboto3.Session()
+        responses = self.responses_per_client.pop(0)
+        async with session.client(service, region_name=region_name) as client:
+            with Stubber(client) as stubber:
+                for operation, response, params in responses:
+                    stubber.add_response(operation, response, params)
+                yield client
+
+
+def record_key(resource):
+    """Sort key for comparing scan results."""
+    return (resource.region, resource.resource_type, resource.resource_id)
+
+
+SCAN_DATA = {
+    "describe_volumes": [
+        {"Volumes": [make_volume("vol-1")]},
+        {"Volumes": [make_volume("vol-2", size=20, volume_type="io1")]},
+    ],
+    "describe_load_balancers": [
+        {
+            "LoadBalancers": [
+                {
+                    "LoadBalancerArn": "arn:lb/idle",
+                    "LoadBalancerName": "idle-lb",
+                    "CreatedTime": datetime(2025, 1, 1, tzinfo=timezone.utc),
+                },
+                {
+                    "LoadBalancerArn": "arn:lb/busy",
+                    "LoadBalancerName": "busy-lb",
+                    "CreatedTime": datetime(2025, 1, 1, tzinfo=timezone.utc),
+                },
+            ]
+        }
+    ],
+    "target_groups": {
+        "arn:lb/idle": ["arn:tg/idle"],
+        "arn:lb/busy": ["arn:tg/unused", "arn:tg/busy"],
+    },
+    "target_health": {
+        "arn:tg/idle": "unhealthy",
+        "arn:tg/unused": "unused",
+        "arn:tg/busy": "healthy",
+    },
+    "addresses": [
+        {"PublicIp": "198.51.100.1"},
+        {"PublicIp": "198.51.100.2", "InstanceId": "i-123"},
+    ],
+}
+
+
+def _pages(data, operation, kwargs):
+    """Return the canned pages for a paginated operation."""
+    if operation == "describe_target_groups":
+        arns = data["target_groups"][kwargs["LoadBalancerArn"]]
+        return [{"TargetGroups": [{"TargetGroupArn": arn} for arn in arns]}]
+    return data[operation]
+
+
+def _target_health(data, arn):
+    """Return a canned describe_target_health response."""
+    state = data["target_health"][arn]
+    return {"TargetHealthDescriptions": [{"TargetHealth": {"State": state}}]}
+
+
+class FakePaginator:
+    """Paginator returning canned pages, usable sync or async."""
+
+    def __init__(self, data, operation):
+        self.data = data
+        self.operation = operation
+
+    def paginate(self, **kwargs):
+        self.pages = _pages(self.data, self.operation, kwargs)
+        return self
+
+    def __iter__(self):
+        return iter(self.pages)
+
+    async def __aiter__(self):
+        for page in self.pages:
+            yield page
+
+
+class FakeClient:
+    """Minimal stand-in for the boto3 ec2/elbv2 clients."""
+
+    def __init__(self, data):
+        self.data = data
+        self.meta = MagicMock()
+        self.meta.config.max_pool_connections = 10
+
+    def get_paginator(self, operation):
+        return FakePaginator(self.data, operation)
+
+    def describe_target_health(self, TargetGroupArn):
+        return _target_health(self.data, TargetGroupArn)
+
+    def describe_addresses(self, Filters):
+        return {"Addresses": self.data["addresses"]}
+
+
+class FakeAsyncClient(FakeClient):
+    """Minimal stand-in for aioboto3 clients."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def describe_target_health(self, TargetGroupArn):
+        return _target_health(self.data, TargetGroupArn)
+
+    async def describe_addresses(self, Filters):
+        return {"Addresses": self.data["addresses"]}
+
+
+class FakeAioboto3:
+    """Stand-in for the aioboto3 module."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def Session(self):
+        return self
+
+    def client(self, service, region_name):
+        return FakeAsyncClient(self.data)
@@ -0,0 +1,15 @@
+"""
+Output helpers shared by the CLI tools.
+"""
+
+import sys
+
+# Above this many rows, tables are written as plain text instead of rich tables.
+PLAIN_ROW_THRESHOLD = 500
+
+
+def write_plain_table(headers: list[str], rows: list[tuple[str, ...]]) -> None:
+    """Write rows as tab-separated text, bypassing rich table rendering."""
+    lines = ["\t".join(headers)]
+    lines.extend("\t".join(row) for row in rows)
+    sys.stdout.write("\n".join(lines) + "\n")
@@ -0,0 +1,84 @@
+"""
+Client-side throttling for rate-limited AWS APIs.
+Paces EC2 describe requests per region with a shared token bucket.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Optional
+
+# EC2 non-mutating API limits: bucket of 100 requests, refilled at 20/s.
+EC2_DESCRIBE_RATE = 20.0
+EC2_DESCRIBE_BURST = 100
+
+_region_buckets: dict[str, "TokenBucket"] = {}
+_region_buckets_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Simple token bucket, usable from threads and from an event loop."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if one is available, else return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while wait := self._take():
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a token is available."""
+        while wait := self._take():
+            await asyncio.sleep(wait)
+
+
+def region_bucket(region: str) -> TokenBucket:
+    """Get the process-wide EC2 describe bucket for a region."""
+    with _region_buckets_lock:
+        if region not in _region_buckets:
+            _region_buckets[region] = TokenBucket(
+                rate=EC2_DESCRIBE_RATE, capacity=EC2_DESCRIBE_BURST
+            )
+        return _region_buckets[region]
+
+
+def throttle_describe_calls(ec2_client: Any, bucket: TokenBucket) -> None:
+    """Take a token from the bucket before every EC2 Describe* request.
+
+    Hooked on botocore's before-parameter-build event, which fires once per
+    request, so each paginator page is paced.
+    """
+
+    def before_request(model, **kwargs) -> None:
+        if model.name.startswith("Describe"):
+            bucket.acquire()
+
+    ec2_client.meta.events.register("before-parameter-build.ec2", before_request)
+
+
+def throttle_describe_calls_async(ec2_client: Any, bucket: TokenBucket) -> None:
+    """Async variant of throttle_describe_calls for aiobotocore clients."""
+
+    async def before_request(model, **kwargs) -> None:
+        if model.name.startswith("Describe"):
+            await bucket.acquire_async()
+
+    ec2_client.meta.events.register("before-parameter-build.ec2", before_request)